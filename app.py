@@ -1,12 +1,17 @@
+import io
+import os
 import re
-import math
 import collections
-from typing import Dict, List, Tuple
+import functools
+import hashlib
+import heapq
+import importlib
+import types
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, List, Mapping, Tuple
 
 import streamlit as st
 from PyPDF2 import PdfReader
-from PIL import Image, ImageDraw
-import matplotlib.pyplot as plt
 
 st.set_page_config(page_title="ATS Resume Analyzer", page_icon="📄", layout="wide")
 
@@ -33,19 +38,89 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
-# PDF READER (PyPDF2) Streamlit Cloud Safe
-def read_uploaded_file(file) -> str:
-    if not file:
+# PDF READER — fastest backend first, PyPDF2 keeps Streamlit Cloud safe
+# Optional native parsers (see requirements-full.txt) are imported on first use
+@functools.lru_cache(maxsize=None)
+def _try_import(name: str):
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+def _pymupdf_extract(data: bytes) -> str:
+    fitz = _try_import("pymupdf") or _try_import("fitz")  # "fitz" before PyMuPDF 1.24.3
+    if not fitz:
         return ""
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        return "\n".join(page.get_text("text") for page in doc)
+
+
+def _pypdfium2_extract(data: bytes) -> str:
+    pdfium = _try_import("pypdfium2")
+    if not pdfium:
+        return ""
+    pdf = pdfium.PdfDocument(data)
     try:
-        reader = PdfReader(file)
-        text = ""
-        for page in reader.pages:
-            extracted = page.extract_text() or ""
-            text += extracted + "\n"
-        return text
-    except:
+        return "\n".join(page.get_textpage().get_text_range() for page in pdf).replace("\r\n", "\n")
+    finally:
+        pdf.close()
+
+
+def _pypdf2_extract(data: bytes) -> str:
+    reader = PdfReader(io.BytesIO(data))
+    return "".join((page.extract_text() or "") + "\n" for page in reader.pages)
+
+
+def _pdfplumber_extract(data: bytes) -> str:
+    pdfplumber = _try_import("pdfplumber")
+    if not pdfplumber:
+        return ""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return "\n".join((page.extract_text() or "") for page in pdf.pages)
+
+
+def _pdfminer_extract(data: bytes) -> str:
+    pdfminer = _try_import("pdfminer.high_level")
+    if not pdfminer:
         return ""
+    return pdfminer.extract_text(io.BytesIO(data)) or ""
+
+
+# Fastest first; override with e.g. PROFILE_PDF_PARSERS="pypdf2,pdfminer"
+_PDF_PARSERS = {
+    "pymupdf": _pymupdf_extract,
+    "pypdfium2": _pypdfium2_extract,
+    "pypdf2": _pypdf2_extract,
+    "pdfplumber": _pdfplumber_extract,
+    "pdfminer": _pdfminer_extract,
+}
+_PDF_PARSER_ORDER = [
+    name for name in (n.strip() for n in os.environ.get("PROFILE_PDF_PARSERS", ",".join(_PDF_PARSERS)).lower().split(","))
+    if name in _PDF_PARSERS
+] or list(_PDF_PARSERS)  # an override with no valid names (typo, empty) would otherwise parse nothing
+
+
+# Cached on the upload bytes
+@st.cache_data(show_spinner=False, max_entries=32)
+def _extract_text_from_pdf_bytes(data: bytes) -> str:
+    # Not a PDF (header may follow up to 1KB of junk) — don't feed it to every parser
+    if b"%PDF" not in data[:1024]:
+        return ""
+    for name in _PDF_PARSER_ORDER:
+        try:
+            text = _PDF_PARSERS[name](data)
+        except Exception:
+            continue
+        if text.strip():
+            return text
+    return ""
+
+
+def read_uploaded_file(file) -> str:
+    if not file:
+        return ""
+    return _extract_text_from_pdf_bytes(file.getvalue())
 
 
 # CLEAN STRUCTURED PREVIEW#
@@ -53,24 +128,42 @@ SECTION_TOKENS = [
     "summary", "objective", "skills", "education", "experience",
     "projects", "certifications", "leadership", "achievements"
 ]
+_BULLET_CHARS = ("•", "-", "*")
+
+
+# One pass over the lines, shared by the preview and the recruiter view
+@functools.lru_cache(maxsize=32)
+def _parse_lines(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], FrozenSet[int]]:
+    lines, bullets, headers = [], [], set()
+    for i, line in enumerate(text.split("\n")):
+        line = line.strip()
+        lines.append(line)
+        if not line:
+            continue
+        if line.isupper() or any(h in line.lower() for h in SECTION_TOKENS):
+            headers.add(i)
+        if line.startswith(_BULLET_CHARS) and line[1:].strip():
+            bullets.append(line[1:].strip())
+    return tuple(lines), tuple(bullets), frozenset(headers)
 
+
+@st.cache_data(show_spinner=False, max_entries=32)
 def clean_preview_text(text: str) -> str:
-    lines = text.split("\n")
+    lines, _, headers = _parse_lines(text)
     cleaned = []
 
-    for line in lines:
-        line = line.strip()
+    for i, line in enumerate(lines):
         if not line:
             cleaned.append("")
             continue
 
         # Section headings
-        if line.isupper() or any(h in line.lower() for h in SECTION_TOKENS):
+        if i in headers:
             cleaned.append("\n" + line.upper())
             continue
 
         # Bullet cleanup
-        if re.match(r"^[•\-\*]", line):
+        if line.startswith(_BULLET_CHARS):
             cleaned.append("  - " + line.lstrip("•-* ").strip())
         else:
             cleaned.append(line)
@@ -96,7 +189,7 @@ SKILL_LEXICON = {
     "Cloud/DB": {"aws","gcp","azure","mysql","postgres","snowflake","bigquery","mongodb"}
 }
 
-STOPWORDS = set((
+STOPWORDS = frozenset((
     "a an the and or of for to with in on at as by from into over under about "
     "is are was were be being been it this that these those you your our their "
     "he she they them his her its who which what where when why how not then "
@@ -106,73 +199,150 @@ STOPWORDS = set((
 
 # HELPER FUNCTIONS
 
-def words(text: str) -> List[str]:
-    return re.findall(r"[a-zA-Z][a-zA-Z\+\#\-]{1,}", text.lower())
-
+# Less text than this means extraction failed (scanned / image-only PDF); skip the scans
+MIN_RESUME_CHARS = 100
+TOO_SHORT_MSG = "Resume text too short or unreadable — upload a text-based PDF (scanned resumes need OCR first)."
 
-def extract_skills(text: str) -> Dict[str, List[str]]:
-    found = {}
-    low = text.lower()
+_WORD_RE = re.compile(r"[a-zA-Z][a-zA-Z\+\#\-]{1,}")
+_METRIC_RE = re.compile(r"\b\d+(?:\.\d+)?%?\b")
+_NAME_RE = re.compile(r"[A-Z][a-z]+ [A-Z][a-z]+")
+# Already sorted, so matches come out in display order
+_TEMPLATE_SKILLS = ("excel", "ml", "numpy", "pandas", "power bi", "python", "sql", "tableau")
 
-    for cat, items in SKILL_LEXICON.items():
-        hits = []
-        for skill in items:
-            if " " in skill:
-                if skill in low:
-                    hits.append(skill)
-            else:
-                if re.search(fr"\b{skill}\b", low):
-                    hits.append(skill)
-        if hits:
-            found[cat] = sorted(set(hits))
 
-    return found
+def words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+
+# Single-word skills are matched against one token set; phrases ("power bi") by one alternation scan
+_SKILL_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9\+\#/\-]*")
+_SKILL_SPLIT_RE = re.compile(r"[/\-]")
+_SKILL_WORDS = {cat: frozenset(s for s in items if " " not in s) for cat, items in SKILL_LEXICON.items()}
+_SKILL_PHRASE_CATS = {s: cat for cat, items in SKILL_LEXICON.items() for s in items if " " in s}
+_SKILL_PHRASE_RE = re.compile(
+    r"\b(?:" + "|".join(
+        re.escape(p).replace(r"\ ", r"\s+")  # PDF text often wraps inside a phrase
+        for p in sorted(_SKILL_PHRASE_CATS, key=len, reverse=True)
+    ) + r")\b"
+)
+
+
+# One tokenization shared by the skill and action-verb scans
+@functools.lru_cache(maxsize=32)
+def resume_tokens(low: str) -> FrozenSet[str]:
+    # "scikit-learn" and "ci/cd" stay whole, "python-based" also yields "python"
+    tokens = set()
+    for tok in _SKILL_TOKEN_RE.findall(low):
+        tokens.add(tok)
+        if "-" in tok or "/" in tok:
+            tokens.update(_SKILL_SPLIT_RE.split(tok))
+    return frozenset(tokens)
+
+
+def extract_skills(text: str) -> Mapping[str, Tuple[str, ...]]:
+    return _match_skills(text.lower())
+
+
+# Takes the already-lowercased resume; read-only result so cached hits can't be mutated
+@functools.lru_cache(maxsize=32)
+def _match_skills(low: str) -> Mapping[str, Tuple[str, ...]]:
+    tokens = resume_tokens(low)
+    hits = {cat: set(items & tokens) for cat, items in _SKILL_WORDS.items()}
+
+    for m in _SKILL_PHRASE_RE.finditer(low):
+        phrase = " ".join(m.group().split())
+        hits[_SKILL_PHRASE_CATS[phrase]].add(phrase)
+
+    found = {cat: tuple(sorted(h)) for cat, h in hits.items() if h}
+    return types.MappingProxyType(found)
+
+
+# Stem -> section it evidences; substring match so "Skillset" or "Educational Background" count
+_SECTION_STEMS = {
+    "summary": "summary",
+    "project": "projects",
+    "experience": "experience",
+    "education": "education",
+    "skill": "skills",
+    "linkedin": "links", "github": "links",
+}
+_SECTION_STEM_RE = re.compile("|".join(_SECTION_STEMS))
+_MISSING_SECTION_MSGS = {
+    "summary": "Add a strong 2–3 line Professional Summary.",
+    "projects": "Add at least 2–3 project highlights.",
+    "experience": "Add Experience section (internships, freelance, roles).",
+    "education": "Add Education details.",
+    "skills": "Add Skills section.",
+    "links": "Add LinkedIn / GitHub links.",
+}
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def detect_missing_sections(text: str) -> List[str]:
-    low = text.lower()
-    missing = []
+    if len(text.strip()) < MIN_RESUME_CHARS:
+        return [TOO_SHORT_MSG]
+    present = analyze_resume(text)["sections"]
+    return [msg for section, msg in _MISSING_SECTION_MSGS.items() if section not in present]
 
-    if "summary" not in low:
-        missing.append("Add a strong 2–3 line Professional Summary.")
-    if "project" not in low:
-        missing.append("Add at least 2–3 project highlights.")
-    if "experience" not in low:
-        missing.append("Add Experience section (internships, freelance, roles).")
-    if "education" not in low:
-        missing.append("Add Education details.")
-    if "skill" not in low:
-        missing.append("Add Skills section.")
-    if not ("linkedin" in low or "github" in low):
-        missing.append("Add LinkedIn / GitHub links.")
 
-    return missing
+_TABLE_RE = re.compile(r"\|.+\|")
+_FANCY_BULLETS = frozenset("●■◆▶▪")
 
 
 def detect_format_issues(text: str) -> List[str]:
     issues = []
-    if re.search(r"\|.+\|", text):
+    # Cheap pipe count first; the regex only confirms both pipes share a line
+    if text.count("|") >= 2 and _TABLE_RE.search(text):
         issues.append("Remove table formatting — ATS cannot read tables.")
-    if re.search(r"[●■◆▶▪]", text):
+    if not _FANCY_BULLETS.isdisjoint(text):
         issues.append("Avoid fancy bullet icons — use '-' or '*'.")
     return issues
 
 
+# SHARED RESUME FEATURES — computed once, read by every view#
+
+# Plain builtins only: Streamlit re-runs this script as a fresh __main__, so a class defined
+# here can't be pickled into (or back out of) st.cache_data across concurrent sessions.
+# Keys: low, skills, verb_count, metrics, bullets, sections, format_issues
+@st.cache_data(show_spinner=False, max_entries=32)
+def analyze_resume(text: str) -> Dict[str, Any]:
+    low = text.lower()
+    tokens = resume_tokens(low)
+    return {
+        "low": low,
+        "skills": dict(_match_skills(low)),
+        "verb_count": len(ACTION_VERBS & tokens),
+        "metrics": tuple(_METRIC_RE.findall(text)),
+        "bullets": _parse_lines(text)[1],
+        "sections": frozenset(_SECTION_STEMS[m.group()] for m in _SECTION_STEM_RE.finditer(low)),
+        "format_issues": tuple(detect_format_issues(text)),
+    }
+
+
 # ATS BREAKDOWN — 100-POINT SYSTEM#
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def ats_breakdown(text: str, exp_level: str):
-    fmt_issues = detect_format_issues(text)
+    if len(text.strip()) < MIN_RESUME_CHARS:
+        breakdown = dict.fromkeys([
+            "Formatting", "Skills Relevance", "Keyword Coverage",
+            "Experience Strength", "Metrics & Impact", "Seniority Alignment"
+        ], 0)
+        return 0, breakdown, [TOO_SHORT_MSG]
+
+    features = analyze_resume(text)
+    fmt_issues = list(features["format_issues"])
 
     fmt_score = 20 - min(8, 2 * len(fmt_issues))
-    skills_found = extract_skills(text)
+    skills_found = features["skills"]
     skills_score = min(20, len(skills_found) * 4)
 
     keyword_score = min(15, int(1.5 * sum(len(v) for v in skills_found.values())))
 
-    verbs = sum(1 for v in ACTION_VERBS if v in text.lower())
-    exp_score = min(20, min(10, verbs) + (5 if "experience" in text.lower() else 0))
+    verbs = features["verb_count"]
+    exp_score = min(20, min(10, verbs) + (5 if "experience" in features["low"] else 0))
 
-    metrics = len(re.findall(r"\b\d+(?:\.\d+)?%?\b", text))
+    metrics = len(features["metrics"])
     metrics_score = min(15, metrics)
 
     seniority_score = 10  # simple for now
@@ -205,25 +375,50 @@ def ats_breakdown(text: str, exp_level: str):
 
 # GAUGE#
 
+# Pillow / matplotlib are imported inside the drawing functions so cold start skips them
+
+# One font object for every image so its glyph metrics are built once per process
+@st.cache_resource(show_spinner=False)
+def _font():
+    from PIL import ImageFont
+    return ImageFont.load_default()
+
+
 def draw_half_gauge(score: int):
+    from PIL import Image, ImageDraw
     width, height = 600, 350
     img = Image.new("RGB", (width, height), "white")
     draw = ImageDraw.Draw(img)
     draw.arc((50, 50, 550, 550), 180, 0, fill="lightgray", width=40)
     end_angle = 180 + (180 * score / 100)
     draw.arc((50, 50, 550, 550), 180, end_angle, fill="green", width=40)
-    draw.text((260, 200), f"{score}%", fill="black")
+    draw.text((260, 200), f"{score}%", fill="black", font=_font())
     return img
 
 
+def _png_bytes(img) -> bytes:
+    # Fast zlib level: encode time matters more than a few KB on these small images
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+# Rendered images are cached as PNG bytes so reruns skip drawing and encoding
+# Scores are whole numbers 0–100, so the gauge has at most 101 distinct renders
+@st.cache_data(show_spinner=False, max_entries=101)
+def _gauge_png(score: int) -> bytes:
+    return _png_bytes(draw_half_gauge(score))
+
+
 # LOCAL VISUAL SUGGESTION IMAGE no more broken link
 
 def generate_layout_suggestion():
+    from PIL import Image, ImageDraw
     img = Image.new("RGB", (900, 350), "#f5f5f5")
     draw = ImageDraw.Draw(img)
     draw.rectangle((20, 20, 880, 330), fill="white")
 
-    draw.text((40, 40), "Resume Layout Suggestions", fill="black")
+    draw.text((40, 40), "Resume Layout Suggestions", fill="black", font=_font())
 
     bullets = [
         "• Use sections: Summary | Skills | Experience | Projects | Education",
@@ -235,45 +430,102 @@ def generate_layout_suggestion():
 
     y = 90
     for b in bullets:
-        draw.text((40, y), b, fill="gray")
+        draw.text((40, y), b, fill="gray", font=_font())
         y += 40
 
     return img
 
 
+@st.cache_data(show_spinner=False)
+def _layout_png() -> bytes:
+    return _png_bytes(generate_layout_suggestion())
+
+
 # AI RESUME CARD PREVIEW#
 
-def generate_ai_resume(text):
+_AI_RESUME_HINTS = {
+    "SKILLS": "Python • SQL • ML • Power BI",
+    "EXPERIENCE": "Use action verbs + metrics.",
+    "EDUCATION": "Add degree + institute + year"
+}
+_SUMMARY_CARD = (60, 150, 890, 370)
+_CARD_INSET = 20  # text starts this far in from the card's left edge; keep the same gap on the right
+_WRAP_WIDTH = _SUMMARY_CARD[2] - _SUMMARY_CARD[0] - 2 * _CARD_INSET
+_LINE_SPACING = 6
+
+
+def _wrap(text: str, width: int = _WRAP_WIDTH) -> List[str]:
+    # Keep the resume's own line breaks; wrap by rendered width, since "W" is twice as wide as "l"
+    font = _font()
+    lines = []
+    for ln in text.splitlines():
+        line = ""
+        for word in ln.split():
+            candidate = f"{line} {word}" if line else word
+            if font.getlength(candidate) <= width:
+                line = candidate
+                continue
+            if line:
+                lines.append(line)
+            # A single word wider than the card (a long URL) is broken between characters
+            while font.getlength(word) > width:
+                cut = next(i for i in range(1, len(word) + 1) if font.getlength(word[:i]) > width) - 1
+                lines.append(word[:max(cut, 1)])
+                word = word[max(cut, 1):]
+            line = word
+        lines.append(line)
+    return lines
+
+
+def _draw_lines(draw, xy, lines, fill):
+    # Same pitch multiline_text uses, without it re-splitting and re-measuring per call
+    x, y = xy
+    font = _font()
+    line_h = font.getbbox("A")[3] + _LINE_SPACING
+    for i, ln in enumerate(lines):
+        draw.text((x, y + i * line_h), ln, fill=fill, font=font)
+
+
+# Frame, cards, headings and fixed hints never change — draw them once per process
+@st.cache_resource(show_spinner=False)
+def _ai_resume_base():
+    from PIL import Image, ImageDraw
     img = Image.new("RGB", (950, 1300), "white")
     draw = ImageDraw.Draw(img)
     draw.rectangle((40, 40, 910, 1260), fill="#f5f5f5")
 
-    draw.text((60, 60), "AI-Improved Resume Layout", fill="black")
-
-    sections = {
-        "SUMMARY": text[:220] or "Add a 2–3 line summary.",
-        "SKILLS": "Python • SQL • ML • Power BI",
-        "EXPERIENCE": "Use action verbs + metrics.",
-        "EDUCATION": "Add degree + institute + year"
-    }
+    draw.text((60, 60), "AI-Improved Resume Layout", fill="black", font=_font())
 
     y = 150
-    for h, c in sections.items():
+    for h in ["SUMMARY", *_AI_RESUME_HINTS]:
         draw.rectangle((60, y, 890, y+220), fill="white")
-        draw.text((80, y+10), h, fill="black")
-        draw.multiline_text((80, y+60), c, fill="gray", spacing=6)
+        draw.text((80, y+10), h, fill="black", font=_font())
+        if h in _AI_RESUME_HINTS:
+            _draw_lines(draw, (80, y+60), [_AI_RESUME_HINTS[h]], "gray")
         y += 240
 
     return img
 
-def auto_fill_template(text):
-    names = re.findall(r"[A-Z][a-z]+ [A-Z][a-z]+", text)
-    name = names[0] if names else "FULL NAME"
 
-    skills = re.findall(r"python|sql|excel|tableau|power bi|ml|numpy|pandas", text.lower())
-    skills = ", ".join(sorted(set(skills))) or "Technical Skills Not Detected"
+def generate_ai_resume(text):
+    from PIL import ImageDraw
+    img = _ai_resume_base().copy()
+
+    # Draw the summary inside its own card so long text can't spill onto the next one
+    card = img.crop(_SUMMARY_CARD)
+    _draw_lines(ImageDraw.Draw(card), (_CARD_INSET, 60), _wrap(text[:220] or "Add a 2–3 line summary."), "gray")
+    img.paste(card, _SUMMARY_CARD[:2])
+
+    return img
+
+
+# Only the first 220 chars reach the card, so key the cache on that
+@st.cache_data(show_spinner=False, max_entries=32)
+def _ai_resume_png(snippet: str) -> bytes:
+    return _png_bytes(generate_ai_resume(snippet))
 
-    return f"""
+# Only the name and skills vary; the rest of the layout is fixed
+_TEMPLATE = """
 -----------------------------------------
 | {name} |
 -----------------------------------------
@@ -292,101 +544,166 @@ EDUCATION
 """
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def auto_fill_template(text):
+    m = _NAME_RE.search(text)  # stops at the first match instead of listing every one
+    name = m.group() if m else "FULL NAME"
+
+    # Set lookups on the cached tokens; "power bi" comes from the lexicon's phrase matches
+    features = analyze_resume(text)
+    tokens = resume_tokens(features["low"])
+    phrases = {p for items in features["skills"].values() for p in items}
+    skills = ", ".join(s for s in _TEMPLATE_SKILLS if s in tokens or s in phrases) or "Technical Skills Not Detected"
+
+    return _TEMPLATE.format(name=name, skills=skills)
+
+
 # Recruiter View Simulation#
 
+@st.cache_data(show_spinner=False, max_entries=32)
 def recruiter_view(text: str):
-    bullets = re.findall(r"(?:^|\n)\s*(?:•|\-|\*)\s*(.+)", text)
-    metrics = re.findall(r"\b\d+(?:\.\d+)?%?\b", text)
-    skills = extract_skills(text)
+    if len(text.strip()) < MIN_RESUME_CHARS:
+        return {"top_skills": [], "quick_reads": [], "readability": [TOO_SHORT_MSG]}
+
+    features = analyze_resume(text)
+    bullets = features["bullets"]
+    metrics = features["metrics"]
+    skills = features["skills"]
 
-    top_skills = sorted(
-        ((k, len(v)) for k, v in skills.items()),
-        key=lambda x: -x[1]
-    )[:3]
+    top_skills = heapq.nlargest(3, ((k, len(v)) for k, v in skills.items()), key=itemgetter(1))
 
     read = []
     if len(bullets) < 6:
         read.append("Add more bullet points with action verbs.")
     if len(metrics) < 3:
         read.append("Add measurable outcomes (time saved, % improvement).")
-    if "summary" not in text.lower():
+    if "summary" not in features["low"]:
         read.append("Add a professional summary at the top.")
 
     return {
         "top_skills": [f"{c} ({n})" for c, n in top_skills],
-        "quick_reads": bullets[:5],
+        "quick_reads": list(bullets[:5]),
         "readability": read
     }
 
 
+# Insights Chart#
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _top_words_png(text: str) -> bytes:
+    tokens = (m.group() for m in _WORD_RE.finditer(text.lower()))
+    counts = collections.Counter(w for w in tokens if len(w) > 2 and w not in STOPWORDS).most_common(10)
+
+    if not counts:
+        return b""
+
+    labels, vals = zip(*counts)
+    # A standalone Figure (Agg canvas, no pyplot) so concurrent sessions never share pyplot's "current figure"
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(6,3))
+    ax = fig.subplots()
+    ax.bar(range(len(vals)), vals)
+    ax.set_xticks(range(len(labels)), labels, rotation=45)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")  # st.pyplot's defaults
+    return buf.getvalue()
+
+
+def plot_top_words(text):
+    png = _top_words_png(text)
+    if not png:
+        st.info("Not enough content for insights.")
+        return
+    st.image(png, output_format="PNG")
+
+
 # UI#
 
 with st.sidebar:
     st.header("Upload Resume")
-    file = st.file_uploader("Upload PDF Resume")
+    file = st.file_uploader("Upload PDF Resume", type=["pdf"])
     exp_level = st.selectbox("Experience Level", ["Fresher","Intern","1+ Years","5+ Years"])
     btn = st.button("Analyze", type="primary")
 
-resume = read_uploaded_file(file) if btn and file else ""
+# Extract once per upload; later reruns (e.g. changing experience level) reuse the stored text.
+# Keyed on the content, since two different "resume.pdf" uploads can share a name and size.
+resume_key = hashlib.sha256(file.getvalue()).hexdigest() if file else None
+if btn and file and st.session_state.get("resume_key") != resume_key:
+    st.session_state["resume_key"] = resume_key
+    st.session_state["resume_text"] = read_uploaded_file(file)
+    st.session_state.pop("resume_preview", None)
+
+analyzed = bool(file) and st.session_state.get("resume_key") == resume_key
+resume = st.session_state.get("resume_text", "") if analyzed else ""
 
-tabs = st.tabs([
+if analyzed and not resume.strip():
+    st.warning("No text could be extracted from this PDF. If it is a scanned image, run it through OCR and upload the text-based PDF.")
+
+# One markdown element per list instead of one st.write per item
+def md_list(items, mark):
+    if items:
+        st.markdown("\n".join(f"{mark} {i}  " for i in items))
+
+# Only the selected view runs; st.tabs would execute every tab body on each rerun
+VIEWS = [
     "Preview","ATS Score","Missing Sections","AI Resume",
     "Auto Sample Template","Insights","Recruiter View"
-])
+]
+view = st.radio("View", VIEWS, horizontal=True, key="view", label_visibility="collapsed")
 
 
 # Preview
 
-with tabs[0]:
+if view == "Preview":
     if resume:
-        st.text_area("Parsed Resume", clean_preview_text(resume), height=360)
+        # Cleaned once per upload, like the extracted text it comes from
+        if "resume_preview" not in st.session_state:
+            st.session_state["resume_preview"] = clean_preview_text(resume)
+        st.text_area("Parsed Resume", st.session_state["resume_preview"], height=360)
     else:
         st.info("Upload a resume to begin.")
 
 
 # ATS Score
 
-with tabs[1]:
+elif view == "ATS Score":
     if resume:
         score, breakdown, tips = ats_breakdown(resume, exp_level)
-        st.image(draw_half_gauge(score))
+        st.image(_gauge_png(int(round(score))), output_format="PNG")
 
         st.subheader("Score Breakdown")
-        for k, v in breakdown.items():
-            st.write(f"**{k}**: {v}")
+        st.markdown("| Component | Points |\n|---|---|\n" + "\n".join(f"| **{k}** | {v} |" for k, v in breakdown.items()))
 
         st.subheader("Suggestions")
-        for t in tips:
-            st.write("✅", t)
+        md_list(tips, "✅")
     else:
         st.info("Upload resume to calculate ATS score.")
 
 
 # Missing Sections
 
-with tabs[2]:
+elif view == "Missing Sections":
     if resume:
         st.subheader("Missing Sections")
-        for m in detect_missing_sections(resume):
-            st.write("✅", m)
+        md_list(detect_missing_sections(resume), "✅")
 
         st.subheader("Visual Improvement Suggestion")
-        st.image(generate_layout_suggestion())
+        st.image(_layout_png(), output_format="PNG")
     else:
         st.info("Upload resume.")
 
 
 # AI Resume
 
-with tabs[3]:
+elif view == "AI Resume":
     if resume:
-        st.image(generate_ai_resume(resume))
+        st.image(_ai_resume_png(resume[:220]), output_format="PNG")
     else:
         st.info("Upload resume.")
 
 # Auto Template
 
-with tabs[4]:
+elif view == "Auto Sample Template":
     if resume:
         st.code(auto_fill_template(resume))
     else:
@@ -394,21 +711,7 @@ with tabs[4]:
 
 # Insights
 
-def plot_top_words(text):
-    tokens = [w for w in words(text) if w not in STOPWORDS and len(w)>2]
-    counts = collections.Counter(tokens).most_common(10)
-
-    if not counts:
-        st.info("Not enough content for insights.")
-        return
-
-    labels, vals = zip(*counts)
-    fig = plt.figure(figsize=(6,3))
-    plt.bar(range(len(vals)), vals)
-    plt.xticks(range(len(labels)), labels, rotation=45)
-    st.pyplot(fig)
-
-with tabs[5]:
+elif view == "Insights":
     if resume:
         st.subheader("Top Word Frequency")
         plot_top_words(resume)
@@ -417,24 +720,18 @@ with tabs[5]:
 
 # Recruiter View
 
-with tabs[6]:
+elif view == "Recruiter View":
     if resume:
         rv = recruiter_view(resume)
 
         st.subheader("Top Skills Recruiters Will Notice")
-        for s in rv["top_skills"]:
-            st.write("•", s)
+        md_list(rv["top_skills"], "•")
 
         st.subheader("First 5 Bullets Recruiters Read")
-        if rv["quick_reads"]:
-            for b in rv["quick_reads"]:
-                st.write("•", b)
-        else:
-            st.write("• No bullets detected.")
+        md_list(rv["quick_reads"] or ["No bullets detected."], "•")
 
         st.subheader("Readability Suggestions")
-        for r in rv["readability"]:
-            st.write("✅", r)
+        md_list(rv["readability"], "✅")
 
     else:
         st.info("Upload resume.")